@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Any, Dict, Optional, Tuple, List
 
 from .base import BaseAgent
-from ..state import Message, QueryIntent
+from ..state import ClarityStatus, Message, QueryIntent
 from ..guardrails import (
     InputGuardrails,
     CompanyNameValidator,
@@ -266,7 +266,7 @@ IMPORTANT:
             ticker = llm_result.get("detected_ticker")
             intent = llm_result.get("query_intent", "general")
             specific_question = llm_result.get("specific_question", "")
-            clarity_status = llm_result.get("clarity_status", "clear")
+            clarity_status = llm_result.get("clarity_status", ClarityStatus.CLEAR.value)
             clarification_request = llm_result.get("clarification_request")
         else:
             # Fallback to pattern-based extraction
@@ -287,12 +287,12 @@ IMPORTANT:
         # Check for vagueness
         is_vague = self._is_vague_query(sanitized_query, company_name)
         if is_vague and not clarification_request:
-            clarity_status = "needs_clarification"
+            clarity_status = ClarityStatus.NEEDS_CLARIFICATION.value
             clarification_request = self._generate_clarification_request("too_vague", sanitized_query, intent)
 
         # If no company and not a follow-up, ask for clarification
         if not company_name and not self._is_follow_up(state):
-            clarity_status = "needs_clarification"
+            clarity_status = ClarityStatus.NEEDS_CLARIFICATION.value
             clarification_request = self._generate_clarification_request("company_missing", sanitized_query, intent)
 
         # Calculate processing time
@@ -328,7 +328,7 @@ IMPORTANT:
         }
 
         # Handle clarification needed
-        if clarity_status == "needs_clarification":
+        if clarity_status == ClarityStatus.NEEDS_CLARIFICATION:
             updates["awaiting_human_input"] = True
 
         # Audit logging
@@ -501,15 +501,15 @@ IMPORTANT:
 
         # Case 1: Clear query with company identified
         if company_name:
-            return "clear", None
+            return ClarityStatus.CLEAR.value, None
 
         # Case 2: Follow-up with previous context
         if is_follow_up and state.get("detected_company"):
-            return "clear", None
+            return ClarityStatus.CLEAR.value, None
 
         # Case 3: No company identified
         clarification = self._generate_clarification_request("company_missing", query, intent)
-        return "needs_clarification", clarification
+        return ClarityStatus.NEEDS_CLARIFICATION.value, clarification
 
     def _generate_clarification_request(
         self,
@@ -590,7 +590,7 @@ IMPORTANT:
         }
 
         return {
-            "clarity_status": "needs_clarification",
+            "clarity_status": ClarityStatus.NEEDS_CLARIFICATION.value,
             "clarification_request": validation_result.violation_message,
             "current_agent": self.name,
             "error_message": validation_result.violation_message,
@@ -17,7 +17,8 @@ from ..state import (
     ConfidenceBreakdown,
     FactorScore,
     calculate_ragheat_confidence,
-    DEFAULT_FACTOR_WEIGHTS
+    DEFAULT_FACTOR_WEIGHTS,
+    ValidationResult
 )
 from ..tools.research_tool import ResearchTool
 from ..guardrails import CompanyNameValidator
@@ -197,7 +198,7 @@ Respond with analysis of the research quality and any concerns."""
             "factor_scores": factor_scores,
             "research_attempts": attempt,
             "current_agent": self.name,
-            "validation_result": "pending",  # Reset for validator
+            "validation_result": ValidationResult.PENDING.value,  # Reset for validator
             "messages": [Message(
                 role="assistant",
                 content=response_summary,
@@ -12,7 +12,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 
 from .base import BaseAgent
-from ..state import Message
+from ..state import ClarityStatus, Message
 from ..guardrails import (
     InputGuardrails,
     CompanyNameValidator,
@@ -821,7 +821,7 @@ IMPORTANT RULES:
         return {
             "thinksemantic_complete": True,
             "intent_category": result.intent_category.value,
-            "clarity_status": "blocked",
+            "clarity_status": ClarityStatus.BLOCKED.value,
             "clarification_request": block_message,
             "should_proceed": False,
             "current_agent": self.name,
@@ -862,7 +862,7 @@ IMPORTANT RULES:
             return {
                 "thinksemantic_complete": True,
                 "intent_category": result.intent_category.value,
-                "clarity_status": "greeting",
+                "clarity_status": ClarityStatus.GREETING.value,
                 "should_proceed": False,
                 "current_agent": self.name,
                 "workflow_status": "greeting",
@@ -880,7 +880,7 @@ IMPORTANT RULES:
                 "thinksemantic_complete": True,
                 "intent_category": result.intent_category.value,
                 "research_intent": result.research_intent.value if result.research_intent else None,
-                "clarity_status": "needs_clarification",
+                "clarity_status": ClarityStatus.NEEDS_CLARIFICATION.value,
                 "clarification_request": result.clarification_needed or "Could you please specify which company you're asking about?",
                 "should_proceed": False,
                 "current_agent": self.name,
@@ -906,7 +906,7 @@ IMPORTANT RULES:
             "query_intent": result.research_intent.value if result.research_intent else "general",
             "detected_company": result.detected_company,
             "detected_ticker": result.detected_ticker,
-            "clarity_status": "clear",
+            "clarity_status": ClarityStatus.CLEAR.value,
             "should_proceed": True,
             "current_agent": self.name,
             "thinksemantic_reasoning": result.reasoning_chain,
@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from .base import BaseAgent
-from ..state import Message, ResearchFindings
+from ..state import Message, ResearchFindings, ValidationResult
 
 
 @dataclass
@@ -409,22 +409,22 @@ Focus on whether the research provides VALUE to the user, not perfection."""
         # Check if max attempts reached - proceed regardless
         if attempts >= self.criteria.max_attempts:
             return (
-                "sufficient",
+                ValidationResult.SUFFICIENT.value,
                 "Maximum attempts reached. Proceeding with best available data."
             )
 
         # Use LLM result if available
         llm_result = llm_assessment.get("validation_result")
-        if llm_result in ["sufficient", "insufficient"]:
+        if llm_result in (ValidationResult.SUFFICIENT, ValidationResult.INSUFFICIENT):
             # Trust LLM assessment but add our metrics
-            if llm_result == "sufficient":
-                return "sufficient", None
+            if llm_result == ValidationResult.SUFFICIENT:
+                return ValidationResult.SUFFICIENT.value, None
 
             # Generate feedback for insufficient
             feedback = llm_assessment.get("validation_feedback") or self._generate_feedback(
                 completeness_score, relevance_score, confidence_score, missing_elements
             )
-            return "insufficient", feedback
+            return ValidationResult.INSUFFICIENT.value, feedback
 
         # Rule-based fallback
         # Check minimum thresholds
@@ -433,29 +433,29 @@ Focus on whether the research provides VALUE to the user, not perfection."""
             if missing_elements:
                 feedback += f"Missing: {', '.join(missing_elements[:3])}. "
             feedback += "Try to gather more comprehensive data."
-            return "insufficient", feedback
+            return ValidationResult.INSUFFICIENT.value, feedback
 
         if completeness_score < self.criteria.min_completeness_threshold:
             feedback = self._generate_feedback(
                 completeness_score, relevance_score, confidence_score, missing_elements
             )
-            return "insufficient", feedback
+            return ValidationResult.INSUFFICIENT.value, feedback
 
         if relevance_score < self.criteria.min_relevance_threshold:
             feedback = (
                 "Research doesn't fully address the user's question. "
                 "Focus on gathering information more directly related to their query."
             )
-            return "insufficient", feedback
+            return ValidationResult.INSUFFICIENT.value, feedback
 
         # Validation score threshold
         if validation_score >= 0.6:
-            return "sufficient", None
+            return ValidationResult.SUFFICIENT.value, None
         else:
             feedback = self._generate_feedback(
                 completeness_score, relevance_score, confidence_score, missing_elements
             )
-            return "insufficient", feedback
+            return ValidationResult.INSUFFICIENT.value, feedback
 
     def _generate_feedback(
         self,
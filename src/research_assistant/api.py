@@ -12,6 +12,7 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 import base64
 
 from .app import ResearchAssistantApp
@@ -154,8 +155,11 @@ async def process_query(request: QueryRequest):
                     cached=True,
                 )
 
-        # Process query
-        result = app_instance.start_conversation(request.query)
+        # Process query - the graph run blocks on LLM calls, so keep it
+        # off the event loop to let other requests proceed meanwhile
+        result = await run_in_threadpool(
+            app_instance.start_conversation, request.query
+        )
 
         # Cache successful results
         if result.get("final_response") and not result.get("interrupted"):
@@ -183,7 +187,8 @@ async def continue_conversation(request: ContinueRequest):
     """
     try:
         app_instance = get_app()
-        result = app_instance.continue_conversation(
+        result = await run_in_threadpool(
+            app_instance.continue_conversation,
             request.thread_id,
             request.query
         )
@@ -210,7 +215,8 @@ async def provide_clarification(request: ClarificationRequest):
     """
     try:
         app_instance = get_app()
-        result = app_instance.resume_with_clarification(
+        result = await run_in_threadpool(
+            app_instance.resume_with_clarification,
             request.thread_id,
             request.clarification
         )
@@ -261,6 +267,25 @@ async def get_conversation_state(thread_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.delete("/conversation/{thread_id}")
+async def end_conversation(thread_id: str):
+    """
+    End a conversation and release its stored state.
+    """
+    try:
+        app_instance = get_app()
+        if not app_instance.end_conversation(thread_id):
+            raise HTTPException(status_code=404, detail="Conversation not found")
+
+        return {"success": True, "thread_id": thread_id}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"End conversation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/export")
 async def export_conversation(request: ExportRequest):
     """
@@ -40,7 +40,7 @@ from typing import Any, Dict, List, Optional
 from langgraph.types import Command
 
 from .graph import build_research_graph
-from .state import Message, create_initial_state
+from .state import ClarityStatus, Message, ValidationResult, create_initial_state
 from .utils.persistence import get_checkpointer
 from .guardrails import AuditLogger, GuardrailConfig
 
@@ -177,8 +177,8 @@ class ResearchAssistantApp:
             "user_query": user_query,
             "original_query": user_query,
             "messages": [Message(role="user", content=user_query)],
-            "clarity_status": "pending",
-            "validation_result": "pending",
+            "clarity_status": ClarityStatus.PENDING.value,
+            "validation_result": ValidationResult.PENDING.value,
             "research_attempts": 0,
             "confidence_score": 0.0,
             "awaiting_human_input": False,
@@ -268,8 +268,8 @@ class ResearchAssistantApp:
         updates = {
             "user_query": user_query,
             "messages": [Message(role="user", content=user_query)],
-            "clarity_status": "pending",  # Re-evaluate clarity
-            "validation_result": "pending",
+            "clarity_status": ClarityStatus.PENDING.value,  # Re-evaluate clarity
+            "validation_result": ValidationResult.PENDING.value,
             "research_attempts": 0,  # Reset for new query
             "confidence_score": 0.0,
             "final_response": None,
@@ -470,6 +470,44 @@ class ResearchAssistantApp:
             for tid, info in self._active_sessions.items()
         ]
 
+    def end_conversation(self, thread_id: str) -> bool:
+        """
+        End a conversation and free its checkpointed state.
+
+        Checkpoints are kept after a run completes so follow-up questions
+        can reuse the detected company; call this once a thread is done
+        so long-running servers don't accumulate every thread's history.
+
+        Args:
+            thread_id: The conversation thread ID
+
+        Returns:
+            True if the thread was known to this app or had stored
+            checkpoints (e.g. in a persistent backend after a restart)
+        """
+        session_info = self._active_sessions.pop(thread_id, None)
+
+        # Look the thread up before deleting: after a restart the session
+        # table is empty but a persistent backend still holds its history
+        has_checkpoints = False
+        try:
+            config = {"configurable": {"thread_id": thread_id}}
+            has_checkpoints = self.checkpointer.get_tuple(config) is not None
+            if has_checkpoints:
+                self.checkpointer.delete_thread(thread_id)
+        except Exception as e:
+            logger.error(f"Error deleting thread {thread_id}: {e}")
+
+        if self.audit_logger and session_info:
+            self.audit_logger.log_event(
+                event_type="conversation_ended",
+                session_id=session_info["session_id"],
+                user_id=session_info.get("user_id"),
+                details={"thread_id": thread_id}
+            )
+
+        return session_info is not None or has_checkpoints
+
     def export_audit_logs(self, filepath: str) -> None:
         """
         Export audit logs to a file.
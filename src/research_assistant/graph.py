@@ -6,11 +6,10 @@ import logging
 import traceback
 from datetime import datetime
 from typing import Any, Dict, Literal, Optional
-from functools import wraps
+from functools import lru_cache, wraps
 
 from typing_extensions import TypedDict
 from typing import Annotated, List
-import operator
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -24,12 +23,7 @@ from .routing.conditions import (
     route_after_research,
     route_after_validation,
 )
-from .state import (
-    ResearchAssistantState,
-    Message,
-    create_initial_state,
-    add_messages
-)
+from .state import ClarityStatus, Message, ValidationResult, add_messages
 from .guardrails import AuditLogger, GuardrailConfig
 
 
@@ -39,6 +33,10 @@ class GraphState(TypedDict, total=False):
     State schema for LangGraph workflow with ThinkSemantic.
 
     Using TypedDict ensures proper state merging between nodes.
+
+    Kept as a TypedDict on purpose: LangGraph stores each key as its own
+    channel and hands nodes a plain dict, while a dataclass or Pydantic
+    schema is re-instantiated (``schema(**values)``) on every node call.
     """
     # Query
     user_query: str
@@ -111,6 +109,16 @@ class GraphState(TypedDict, total=False):
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Intent categories that are never researched
+_BLOCKED_INTENTS = frozenset({"manipulation", "insider_trading", "harmful"})
+
+# Shared in-memory checkpointer for graphs built without one, so repeated
+# builds don't each keep a private store of thread histories alive. It is
+# process-wide and never pruned automatically: every such graph's threads
+# live here until deleted with graph.checkpointer.delete_thread(thread_id).
+# Long-running callers should pass their own checkpointer instead.
+_DEFAULT_CHECKPOINTER = MemorySaver()
+
 
 def human_clarification_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -134,7 +142,7 @@ def human_clarification_node(state: Dict[str, Any]) -> Dict[str, Any]:
 
     # Check if this is a blocked query (manipulation, etc.)
     intent_category = state.get("intent_category", "")
-    if intent_category in ["manipulation", "insider_trading", "harmful"]:
+    if intent_category in _BLOCKED_INTENTS:
         # For blocked queries, show the block message and wait for new input
         human_response = interrupt({
             "type": "query_blocked",
@@ -159,7 +167,7 @@ def human_clarification_node(state: Dict[str, Any]) -> Dict[str, Any]:
         "human_response": human_response,
         "awaiting_human_input": False,
         "thinksemantic_complete": False,  # Re-run ThinkSemantic
-        "clarity_status": "pending",
+        "clarity_status": ClarityStatus.PENDING.value,
         "clarification_request": None,
         "intent_category": None,  # Reset intent
         "should_proceed": None,
@@ -246,7 +254,10 @@ def error_handler_node(state: Dict[str, Any]) -> Dict[str, Any]:
         "has_error": True,
         "error_recoverable": recoverable,
         "current_agent": "ErrorHandler",
-        "validation_result": "sufficient" if not recoverable else state.get("validation_result", "pending"),
+        "validation_result": (
+            ValidationResult.SUFFICIENT.value if not recoverable
+            else state.get("validation_result", ValidationResult.PENDING.value)
+        ),
         "messages": [Message(
             role="assistant",
             content=f"[System] {user_message}",
@@ -270,16 +281,23 @@ def create_safe_node(node_name: str, node_func):
             return result
 
         except Exception as e:
-            logger.error(f"Exception in node '{node_name}': {str(e)}")
+            error_text = str(e)
+            logger.error(f"Exception in node '{node_name}': {error_text}")
+            # Let logging format the traceback only when a handler emits it;
+            # it is kept in state only when debugging is enabled
+            logger.debug("Exception in node %s", node_name, exc_info=True)
             return {
                 "has_error": True,
-                "error_message": str(e),
-                "error_traceback": traceback.format_exc(),
+                "error_message": error_text,
+                "error_traceback": (
+                    traceback.format_exc()
+                    if logger.isEnabledFor(logging.DEBUG) else None
+                ),
                 "error_node": node_name,
                 "current_agent": node_name,
                 "messages": [Message(
                     role="assistant",
-                    content=f"[{node_name}] Error: {str(e)[:100]}",
+                    content=f"[{node_name}] Error: {error_text[:100]}",
                     agent=node_name,
                     metadata={"error": True}
                 )]
@@ -310,7 +328,7 @@ def route_after_thinksemantic(state: Dict[str, Any]) -> Literal[
     intent_category = state.get("intent_category", "")
 
     # Blocked queries (manipulation, insider trading, harmful)
-    if intent_category in ["manipulation", "insider_trading", "harmful"]:
+    if intent_category in _BLOCKED_INTENTS:
         logger.info(f"Query BLOCKED: {intent_category}")
         return "human_clarification"
 
@@ -318,11 +336,10 @@ def route_after_thinksemantic(state: Dict[str, Any]) -> Literal[
     if intent_category == "greeting" or state.get("workflow_status") == "greeting":
         return "greeting"
 
-    # Needs clarification
-    if state.get("clarity_status") == "needs_clarification":
-        return "human_clarification"
-
-    if state.get("clarity_status") == "blocked":
+    # Needs clarification or blocked
+    if state.get("clarity_status") in (
+        ClarityStatus.NEEDS_CLARIFICATION, ClarityStatus.BLOCKED
+    ):
         return "human_clarification"
 
     # Check if we should proceed
@@ -369,32 +386,25 @@ def route_after_error(
     return "synthesis"
 
 
-def build_research_graph(
-    checkpointer: Optional[Any] = None,
+def _build_workflow(
     safe_mode: bool = True,
     guardrail_config: Optional[GuardrailConfig] = None,
     audit_logger: Optional[AuditLogger] = None
 ) -> StateGraph:
     """
-    Build and compile the ThinkSemantic research assistant workflow graph.
+    Build the uncompiled ThinkSemantic workflow.
 
-    The ThinkSemantic-first architecture ensures:
-        1. Deep intent analysis BEFORE any action
-        2. Blocked queries never reach research agents
-        3. Intent context flows to all downstream agents
-        4. Accurate routing based on true user intent
+    The topology doesn't depend on the checkpointer, so the result can be
+    compiled against any checkpointer.
 
     Args:
-        checkpointer: Optional checkpointer for state persistence
         safe_mode: If True, wrap nodes with error handling
         guardrail_config: Configuration for guardrails
         audit_logger: Optional audit logger for compliance
 
     Returns:
-        Compiled StateGraph ready for execution
+        Uncompiled StateGraph
     """
-    logger.info("Building research assistant graph with ThinkSemantic strategy")
-
     # Create agents
     thinksemantic_agent = ThinkSemanticIntentAgent(
         guardrail_config=guardrail_config,
@@ -485,9 +495,72 @@ def build_research_graph(
     # Synthesis -> END
     workflow.add_edge("synthesis", END)
 
-    # Use in-memory checkpointer by default
+    return workflow
+
+
+@lru_cache(maxsize=4)
+def _build_default_workflow(safe_mode: bool) -> StateGraph:
+    """Build the workflow once per safe_mode for the default configuration."""
+    return _build_workflow(safe_mode)
+
+
+@lru_cache(maxsize=4)
+def _compile_default_graph(safe_mode: bool):
+    """Compile the default workflow against the shared checkpointer once."""
+    return _build_default_workflow(safe_mode).compile(
+        checkpointer=_DEFAULT_CHECKPOINTER
+    )
+
+
+def build_research_graph(
+    checkpointer: Optional[Any] = None,
+    safe_mode: bool = True,
+    guardrail_config: Optional[GuardrailConfig] = None,
+    audit_logger: Optional[AuditLogger] = None
+) -> StateGraph:
+    """
+    Build and compile the ThinkSemantic research assistant workflow graph.
+
+    The ThinkSemantic-first architecture ensures:
+        1. Deep intent analysis BEFORE any action
+        2. Blocked queries never reach research agents
+        3. Intent context flows to all downstream agents
+        4. Accurate routing based on true user intent
+
+    Without a guardrail config or audit logger the workflow is built once
+    and reused; with the default checkpointer as well, the compiled graph
+    itself is reused.
+
+    Without a checkpointer, the graph uses one process-wide MemorySaver
+    shared by every graph built this way. Its thread histories are never
+    pruned; delete finished threads with
+    ``graph.checkpointer.delete_thread(thread_id)``, or pass a checkpointer
+    whose lifetime you control.
+
+    Args:
+        checkpointer: Optional checkpointer for state persistence
+        safe_mode: If True, wrap nodes with error handling
+        guardrail_config: Configuration for guardrails
+        audit_logger: Optional audit logger for compliance
+
+    Returns:
+        Compiled StateGraph ready for execution
+    """
+    logger.info("Building research assistant graph with ThinkSemantic strategy")
+
+    uses_defaults = guardrail_config is None and audit_logger is None
+
+    # Use the shared in-memory checkpointer by default
     if checkpointer is None:
-        checkpointer = MemorySaver()
+        checkpointer = _DEFAULT_CHECKPOINTER
+
+    if uses_defaults and checkpointer is _DEFAULT_CHECKPOINTER:
+        return _compile_default_graph(safe_mode)
+
+    if uses_defaults:
+        workflow = _build_default_workflow(safe_mode)
+    else:
+        workflow = _build_workflow(safe_mode, guardrail_config, audit_logger)
 
     # Compile the graph
     graph = workflow.compile(checkpointer=checkpointer)
@@ -3,19 +3,178 @@ Input/output validation and safety guardrails for research queries.
 """
 
 import re
+import os
 import json
+import atexit
+import queue
 import logging
-from typing import Optional, Dict, Any, List, Tuple
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Optional, Dict, Any, List, Tuple, Deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Control characters removed from queries; tab/newline/CR are kept so the
+# whitespace collapse in _sanitize_query turns them into spaces.
+_CONTROL_CHAR_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f]
+)
+
+# HTML/XML-style tags removed from queries
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Phrases showing a response already carries a disclaimer (lowercase)
+_DISCLAIMER_MARKERS = ("disclaimer", "not financial advice", "not investment advice")
+
+
+@lru_cache(maxsize=None)
+def _compile_union(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Compile a pattern list into one case-insensitive alternation.
+
+    A single search over the union finds a match if any pattern would,
+    without a separate regex call per pattern. Results are cached, so
+    guardrail instances share the compiled regex instead of recompiling
+    it on every construction.
+
+    Args:
+        patterns: Regex source strings
+
+    Returns:
+        Compiled alternation of all patterns
+    """
+    return re.compile(
+        "|".join(f"(?:{p})" for p in patterns),
+        re.IGNORECASE
+    )
+
+
+@lru_cache(maxsize=None)
+def _compile_lowercase(patterns: Tuple[str, ...]) -> Tuple["re.Pattern[str]", ...]:
+    """
+    Compile lowercase patterns individually for use on lowercased text.
+
+    Without IGNORECASE, sre can jump between occurrences of a pattern's
+    leading literal instead of trying every position, which matters on
+    long texts such as generated responses.
+
+    Args:
+        patterns: Lowercase regex source strings
+
+    Returns:
+        Compiled patterns, in order
+    """
+    return tuple(re.compile(p) for p in patterns)
+
+
+@lru_cache(maxsize=None)
+def _compile_hyperscan(
+    categories: Tuple[Tuple[str, Tuple[str, ...]], ...]
+) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+    """
+    Compile every category's patterns into one Hyperscan database.
+
+    Hyperscan is optional; without it (or if a pattern is rejected) the
+    guardrails keep using the re-based checks alone.
+
+    Args:
+        categories: (category name, patterns) pairs
+
+    Returns:
+        Tuple of (database, category name per pattern id), or None
+    """
+    try:
+        import hyperscan
+
+        names = [name for name, patterns in categories for _ in patterns]
+        expressions = [p.encode() for _, patterns in categories for p in patterns]
+
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+        )
+        logger.info(f"Hyperscan guardrail database compiled ({len(expressions)} patterns)")
+        return database, tuple(names)
+
+    except ImportError:
+        logger.warning("hyperscan not installed, using re-based guardrail checks")
+        return None
+    except Exception as e:
+        logger.error(f"Hyperscan compile failed: {e}, using re-based guardrail checks")
+        return None
+
+
+def _hyperscan_scratch(database: Any, local: threading.local) -> Any:
+    """
+    Return this thread's Hyperscan scratch space, allocating it on first use.
+
+    Scratch space can't be shared between threads, so each thread keeps a
+    clone of the database's scratch in the given thread-local.
+
+    Args:
+        database: Compiled Hyperscan database
+        local: Thread-local holding the scratch
+
+    Returns:
+        Scratch space for the current thread
+    """
+    scratch = getattr(local, "scratch", None)
+    if scratch is None:
+        scratch = database.scratch.clone()
+        local.scratch = scratch
+    return scratch
+
+
+def _prescreen_text(query: str) -> Optional[str]:
+    """
+    Lowercase a query once for the keyword prescreens.
+
+    Non-ASCII queries get None and always go to the regex, since
+    IGNORECASE also folds characters like U+0131 that lower() keeps.
+
+    Args:
+        query: Sanitized query
+
+    Returns:
+        Lowercased query, or None when it is not ASCII
+    """
+    return query.lower() if query.isascii() else None
+
+
+def _may_match(query_lower: Optional[str], keywords: Tuple[str, ...]) -> bool:
+    """
+    Cheap literal prescreen run before a category's regex.
+
+    Every pattern in a category requires at least one of its keywords,
+    so an ASCII query containing none of them cannot match and the regex
+    is skipped.
+
+    Args:
+        query_lower: Result of _prescreen_text for the query
+        keywords: Lowercase literals, one of which every pattern needs
+
+    Returns:
+        True if the category's regex has to run
+    """
+    if query_lower is None:
+        return True
+    return any(keyword in query_lower for keyword in keywords)
+
+
 class GuardrailViolationType(str, Enum):
     """Violation type categories."""
     EMPTY_INPUT = "empty_input"
@@ -33,7 +192,7 @@ class GuardrailViolationType(str, Enum):
     STALE_DATA = "stale_data"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GuardrailResult:
     """Validation result container."""
     passed: bool
@@ -43,12 +202,14 @@ class GuardrailResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GuardrailConfig:
     """
     Configuration for guardrail behavior.
 
-    Allows customization of validation thresholds and features.
+    Allows customization of validation thresholds and features. Configs
+    are immutable and hashable, so guardrails built from an equal config
+    can be shared.
 
     Attributes:
         max_query_length: Maximum allowed query length (chars)
@@ -61,6 +222,9 @@ class GuardrailConfig:
         enable_compliance_checks: Check for market manipulation/insider trading
         require_disclaimers: Add financial disclaimers
         log_all_checks: Log all validation checks
+        use_hyperscan: Scan guardrail patterns with Hyperscan if installed
+        include_metadata: Attach length/timestamp metadata to passing
+            query results; disable when callers never read it
     """
     max_query_length: int = 2000
     min_query_length: int = 3
@@ -72,12 +236,14 @@ class GuardrailConfig:
     enable_compliance_checks: bool = True
     require_disclaimers: bool = True
     log_all_checks: bool = True
+    use_hyperscan: bool = False
+    include_metadata: bool = True
 
 
 class InputGuardrails:
     """Validates and sanitizes user queries."""
 
-    PROMPT_INJECTION_PATTERNS = [
+    PROMPT_INJECTION_PATTERNS = (
         r"ignore\s+(previous|all|above)\s+instructions",
         r"disregard\s+(your|all)\s+instructions",
         r"you\s+are\s+now\s+[a-z]+",
@@ -88,9 +254,9 @@ class InputGuardrails:
         r"<\|.*\|>",
         r"\[\[.*\]\]",
         r"```\s*(system|admin)",
-    ]
+    )
 
-    MARKET_MANIPULATION_PATTERNS = [
+    MARKET_MANIPULATION_PATTERNS = (
         r"pump\s+and\s+dump",
         r"short\s+and\s+distort",
         r"manipulate\s+(the\s+)?(stock|market|price)",
@@ -101,8 +267,6 @@ class InputGuardrails:
         r"spoofing",
         r"layering",
         r"wash\s+trad(e|ing)",
-        r"(how\s+(can|do|to)|help\s+(me\s+)?|want\s+to)\s*dump\s+(my\s+)?(stock|shares|position|holdings?)",
-        r"dump\s+(the\s+)?(stock|shares|market|price)",
         r"(crash|tank|destroy|crush|kill)\s+(the\s+)?(stock|shares|price|market)",
         r"make\s+(the\s+)?(stock|price|shares)\s+(crash|tank|fall|drop|plummet)",
         r"drive\s+(down|up)\s+(the\s+)?(stock|price|shares)",
@@ -114,36 +278,74 @@ class InputGuardrails:
         r"bear\s+raid",
         r"(rig|fix)\s+(the\s+)?(market|stock|price)",
         r"corner\s+the\s+market",
-        r"(how\s+(can|do|to|should)\s+i?|help\s+(me\s+)?|want\s+to|going\s+to|need\s+to)\s*dump\s+\w+",
-        r"dump(ing)?\s+(all\s+)?(my\s+)?\w+\s*(stock|shares|position)?",
-    ]
+        # Covers "dump my shares", "dump the stock", "how can I dump X",
+        # "dumping all my X": any "dump"/"dumping" followed by a word
+        r"dump(ing)?\s+(all\s+)?(my\s+|the\s+)?\w+",
+    )
 
-    INSIDER_TRADING_PATTERNS = [
+    INSIDER_TRADING_PATTERNS = (
         r"insider\s+(trading|information|tips?)",
         r"non\s*-?\s*public\s+information",
         r"material\s+non\s*-?\s*public",
         r"(before|ahead\s+of)\s+(the\s+)?announcement",
         r"trade\s+on\s+confidential",
         r"leak(ed)?\s+(earnings?|merger|acquisition)",
-    ]
+    )
+
+    # Literal prescreen keywords; every pattern above requires at least one
+    # of its category's keywords, so keep these in sync with the patterns
+    PROMPT_INJECTION_KEYWORDS = (
+        "instructions", "now", "pretend", "act", "forget", "system",
+        "<|", "[[", "```",
+    )
+
+    MARKET_MANIPULATION_KEYWORDS = (
+        "dump", "distort", "manipulate", "coordinate", "artificially",
+        "false", "front", "spoofing", "layering", "wash", "crash", "tank",
+        "destroy", "crush", "kill", "make", "drive", "organize", "plan",
+        "everyone", "convince", "persuade", "get", "naked", "ladder",
+        "raid", "rig", "fix", "corner",
+    )
+
+    INSIDER_TRADING_KEYWORDS = (
+        "insider", "public", "announcement", "confidential", "leak",
+    )
+
+    # Shared result for checks that find nothing. GuardrailResult is frozen,
+    # but that doesn't cover the metadata dict, so it gets a read-only one
+    _PASS_RESULT = GuardrailResult(passed=True, metadata=MappingProxyType({}))
 
     def __init__(self, config: Optional[GuardrailConfig] = None):
         self.config = config or GuardrailConfig()
         self._compile_patterns()
 
     def _compile_patterns(self):
-        self._injection_regex = [
-            re.compile(p, re.IGNORECASE)
-            for p in self.PROMPT_INJECTION_PATTERNS
-        ]
-        self._manipulation_regex = [
-            re.compile(p, re.IGNORECASE)
-            for p in self.MARKET_MANIPULATION_PATTERNS
-        ]
-        self._insider_regex = [
-            re.compile(p, re.IGNORECASE)
-            for p in self.INSIDER_TRADING_PATTERNS
-        ]
+        # One alternation per category, so each check is a single pass
+        self._injection_regex = _compile_union(tuple(self.PROMPT_INJECTION_PATTERNS))
+        self._manipulation_regex = _compile_union(tuple(self.MARKET_MANIPULATION_PATTERNS))
+        self._insider_regex = _compile_union(tuple(self.INSIDER_TRADING_PATTERNS))
+
+        # (category, check, patterns) for the checks this config enables,
+        # in priority order. The config is frozen, so this is decided once
+        # here instead of on every query.
+        checks = []
+        if self.config.enable_prompt_injection_detection:
+            checks.append(("injection", self._check_prompt_injection,
+                           tuple(self.PROMPT_INJECTION_PATTERNS)))
+        if self.config.enable_compliance_checks:
+            checks.append(("manipulation", self._check_market_manipulation,
+                           tuple(self.MARKET_MANIPULATION_PATTERNS)))
+            checks.append(("insider", self._check_insider_trading,
+                           tuple(self.INSIDER_TRADING_PATTERNS)))
+        self._checks = tuple((category, check) for category, check, _ in checks)
+
+        self._hyperscan = None
+        if self.config.use_hyperscan and checks:
+            self._hyperscan = _compile_hyperscan(
+                tuple((category, patterns) for category, _, patterns in checks)
+            )
+            # Hyperscan scratch space can't be shared between threads
+            self._hyperscan_local = threading.local()
 
     def validate_query(self, query: str) -> GuardrailResult:
         """Validate user query for safety and compliance."""
@@ -171,22 +373,25 @@ class InputGuardrails:
                 sanitized_content=sanitized[:self.config.max_query_length]
             )
 
-        if self.config.enable_prompt_injection_detection:
-            injection_result = self._check_prompt_injection(sanitized)
-            if not injection_result.passed:
-                return injection_result
-
-        if self.config.enable_compliance_checks:
-            manipulation_result = self._check_market_manipulation(sanitized)
-            if not manipulation_result.passed:
-                return manipulation_result
+        # With Hyperscan, one scan tells which categories can fail;
+        # otherwise (None) every enabled check runs
+        flagged = self._hyperscan_categories(sanitized)
+        # Shared by every category's keyword prescreen
+        query_lower = _prescreen_text(sanitized)
 
-            insider_result = self._check_insider_trading(sanitized)
-            if not insider_result.passed:
-                return insider_result
+        for category, check in self._checks:
+            if flagged is None or category in flagged:
+                result = check(sanitized, query_lower)
+                if not result.passed:
+                    return result
 
         if self.config.log_all_checks:
-            logger.info(f"Query validation passed: {sanitized[:50]}...")
+            # Deferred %-formatting: runs on every query, so skip building
+            # the message when INFO is disabled
+            logger.info("Query validation passed: %.50s...", sanitized)
+
+        if not self.config.include_metadata:
+            return GuardrailResult(passed=True, sanitized_content=sanitized)
 
         return GuardrailResult(
             passed=True,
@@ -194,18 +399,54 @@ class InputGuardrails:
             metadata={
                 "original_length": len(query),
                 "sanitized_length": len(sanitized),
-                "timestamp": datetime.now().isoformat()
+                # Epoch seconds; cheaper than an ISO string nobody reads
+                # on this path, and datetime.fromtimestamp() recovers it
+                "timestamp": time.time()
             }
         )
 
+    def _hyperscan_categories(self, query: str) -> Optional[set]:
+        """
+        Scan a query once with Hyperscan and collect matching categories.
+
+        Args:
+            query: Sanitized query to scan
+
+        Returns:
+            Set of matched category names, or None when Hyperscan is not
+            in use or the query is non-ASCII (its caseless matching only
+            folds ASCII)
+        """
+        if self._hyperscan is None or not query.isascii():
+            return None
+
+        database, names = self._hyperscan
+        flagged = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            flagged.add(names[pattern_id])
+
+        database.scan(
+            query.encode(),
+            match_event_handler=on_match,
+            scratch=_hyperscan_scratch(database, self._hyperscan_local)
+        )
+        return flagged
+
     def _sanitize_query(self, query: str) -> str:
         """Remove harmful content from query."""
-        sanitized = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', query)
-        sanitized = ' '.join(sanitized.split())
-        sanitized = re.sub(r'<[^>]+>', '', sanitized)
-        return sanitized.strip()
-
-    def _check_prompt_injection(self, query: str) -> GuardrailResult:
+        # Printable strings hold no control characters, and translate()
+        # copies the string even when it removes nothing
+        sanitized = query if query.isprintable() else query.translate(_CONTROL_CHAR_TABLE)
+        if '<' in sanitized:
+            sanitized = _TAG_RE.sub('', sanitized)
+        # Collapsing whitespace last also trims the ends and closes gaps
+        # left by removed tags
+        return ' '.join(sanitized.split())
+
+    def _check_prompt_injection(
+        self, query: str, query_lower: Optional[str] = None
+    ) -> GuardrailResult:
         """
         Check for prompt injection attacks.
 
@@ -213,21 +454,36 @@ class InputGuardrails:
 
         Args:
             query: Sanitized query to check
+            query_lower: Prescreen text from validate_query; computed
+                here when the check is called on its own
 
         Returns:
             GuardrailResult with pass/fail status
         """
-        for pattern in self._injection_regex:
-            if pattern.search(query):
-                logger.warning(f"Prompt injection detected: pattern={pattern.pattern}")
-                return GuardrailResult(
-                    passed=False,
-                    violation_type=GuardrailViolationType.PROMPT_INJECTION,
-                    violation_message="Your query contains instructions that I cannot process. Please rephrase your question about company research."
-                )
-        return GuardrailResult(passed=True)
+        if query_lower is None:
+            query_lower = _prescreen_text(query)
+        if not _may_match(query_lower, self.PROMPT_INJECTION_KEYWORDS):
+            return self._PASS_RESULT
+
+        if self._injection_regex.search(query):
+            # Log which pattern fired, never the user's text. Finding it
+            # takes a second pass, but only on this rare path.
+            pattern = next(
+                (p for p in self.PROMPT_INJECTION_PATTERNS
+                 if re.search(p, query, re.IGNORECASE)),
+                None
+            )
+            logger.warning("Prompt injection detected: pattern=%r", pattern)
+            return GuardrailResult(
+                passed=False,
+                violation_type=GuardrailViolationType.PROMPT_INJECTION,
+                violation_message="Your query contains instructions that I cannot process. Please rephrase your question about company research."
+            )
+        return self._PASS_RESULT
 
-    def _check_market_manipulation(self, query: str) -> GuardrailResult:
+    def _check_market_manipulation(
+        self, query: str, query_lower: Optional[str] = None
+    ) -> GuardrailResult:
         """
         Check for market manipulation requests.
 
@@ -236,25 +492,33 @@ class InputGuardrails:
 
         Args:
             query: Sanitized query to check
+            query_lower: Prescreen text from validate_query; computed
+                here when the check is called on its own
 
         Returns:
             GuardrailResult with pass/fail status
         """
-        for pattern in self._manipulation_regex:
-            if pattern.search(query):
-                logger.warning("Market manipulation query detected")
-                return GuardrailResult(
-                    passed=False,
-                    violation_type=GuardrailViolationType.MARKET_MANIPULATION,
-                    violation_message=(
-                        "I cannot provide assistance with market manipulation activities. "
-                        "Such activities are illegal under SEC regulations. "
-                        "Please ask about legitimate company research instead."
-                    )
+        if query_lower is None:
+            query_lower = _prescreen_text(query)
+        if not _may_match(query_lower, self.MARKET_MANIPULATION_KEYWORDS):
+            return self._PASS_RESULT
+
+        if self._manipulation_regex.search(query):
+            logger.warning("Market manipulation query detected")
+            return GuardrailResult(
+                passed=False,
+                violation_type=GuardrailViolationType.MARKET_MANIPULATION,
+                violation_message=(
+                    "I cannot provide assistance with market manipulation activities. "
+                    "Such activities are illegal under SEC regulations. "
+                    "Please ask about legitimate company research instead."
                 )
-        return GuardrailResult(passed=True)
+            )
+        return self._PASS_RESULT
 
-    def _check_insider_trading(self, query: str) -> GuardrailResult:
+    def _check_insider_trading(
+        self, query: str, query_lower: Optional[str] = None
+    ) -> GuardrailResult:
         """
         Check for insider trading related queries.
 
@@ -262,23 +526,29 @@ class InputGuardrails:
 
         Args:
             query: Sanitized query to check
+            query_lower: Prescreen text from validate_query; computed
+                here when the check is called on its own
 
         Returns:
             GuardrailResult with pass/fail status
         """
-        for pattern in self._insider_regex:
-            if pattern.search(query):
-                logger.warning("Insider trading query detected")
-                return GuardrailResult(
-                    passed=False,
-                    violation_type=GuardrailViolationType.INSIDER_TRADING,
-                    violation_message=(
-                        "I cannot provide assistance with insider trading or material non-public information. "
-                        "Trading on such information is illegal. "
-                        "I can only help with publicly available company research."
-                    )
+        if query_lower is None:
+            query_lower = _prescreen_text(query)
+        if not _may_match(query_lower, self.INSIDER_TRADING_KEYWORDS):
+            return self._PASS_RESULT
+
+        if self._insider_regex.search(query):
+            logger.warning("Insider trading query detected")
+            return GuardrailResult(
+                passed=False,
+                violation_type=GuardrailViolationType.INSIDER_TRADING,
+                violation_message=(
+                    "I cannot provide assistance with insider trading or material non-public information. "
+                    "Trading on such information is illegal. "
+                    "I can only help with publicly available company research."
                 )
-        return GuardrailResult(passed=True)
+            )
+        return self._PASS_RESULT
 
 
 # ============================================================================
@@ -317,7 +587,7 @@ class OutputGuardrails:
     )
 
     # Patterns indicating investment advice
-    INVESTMENT_ADVICE_PATTERNS = [
+    INVESTMENT_ADVICE_PATTERNS = (
         r"you\s+should\s+(buy|sell|invest)",
         r"recommend\s+(buying|selling|investing)",
         r"(buy|sell)\s+this\s+stock",
@@ -326,7 +596,7 @@ class OutputGuardrails:
         r"can't\s+lose",
         r"must\s+(buy|sell)",
         r"(great|perfect)\s+time\s+to\s+(buy|sell)",
-    ]
+    )
 
     def __init__(self, config: Optional[GuardrailConfig] = None):
         """
@@ -336,10 +606,14 @@ class OutputGuardrails:
             config: Optional GuardrailConfig for customization
         """
         self.config = config or GuardrailConfig()
-        self._advice_regex = [
-            re.compile(p, re.IGNORECASE)
-            for p in self.INVESTMENT_ADVICE_PATTERNS
-        ]
+        self._advice_regex = _compile_lowercase(tuple(self.INVESTMENT_ADVICE_PATTERNS))
+
+        self._hyperscan = None
+        if self.config.use_hyperscan:
+            self._hyperscan = _compile_hyperscan(
+                (("advice", tuple(self.INVESTMENT_ADVICE_PATTERNS)),)
+            )
+            self._hyperscan_local = threading.local()
 
     def validate_response(
         self,
@@ -360,36 +634,36 @@ class OutputGuardrails:
         Returns:
             GuardrailResult with enhanced response content
         """
-        issues = []
+        # (violation type, message) pairs
+        issues: List[Tuple[GuardrailViolationType, str]] = []
 
         # Check confidence threshold
         if confidence_score < self.config.min_confidence_threshold:
-            issues.append({
-                "type": GuardrailViolationType.LOW_CONFIDENCE,
-                "message": f"Low confidence score: {confidence_score:.1f}/10"
-            })
+            issues.append((
+                GuardrailViolationType.LOW_CONFIDENCE,
+                f"Low confidence score: {confidence_score:.1f}/10"
+            ))
 
         # Check data freshness
         if data_age_hours > self.config.max_data_age_hours:
-            issues.append({
-                "type": GuardrailViolationType.STALE_DATA,
-                "message": f"Data may be stale ({data_age_hours:.1f} hours old)"
-            })
+            issues.append((
+                GuardrailViolationType.STALE_DATA,
+                f"Data may be stale ({data_age_hours:.1f} hours old)"
+            ))
 
-        # Check for investment advice without disclaimer
+        # Check for investment advice without disclaimer. The disclaimer
+        # lookup is cheap, so only scan for advice when it is missing.
         if self.config.require_disclaimers:
-            has_advice = any(p.search(response) for p in self._advice_regex)
-            has_disclaimer = (
-                "disclaimer" in response.lower() or
-                "not financial advice" in response.lower() or
-                "not investment advice" in response.lower()
+            response_lower = response.lower()
+            has_disclaimer = any(
+                marker in response_lower for marker in _DISCLAIMER_MARKERS
             )
 
-            if has_advice and not has_disclaimer:
-                issues.append({
-                    "type": GuardrailViolationType.MISSING_DISCLAIMER,
-                    "message": "Response contains investment advice without disclaimer"
-                })
+            if not has_disclaimer and self._contains_advice(response_lower):
+                issues.append((
+                    GuardrailViolationType.MISSING_DISCLAIMER,
+                    "Response contains investment advice without disclaimer"
+                ))
 
         # Enhance response with warnings and disclaimers if needed
         enhanced_response = self._enhance_response(response, issues, confidence_score)
@@ -398,17 +672,46 @@ class OutputGuardrails:
             passed=True,  # We always pass but may enhance
             sanitized_content=enhanced_response,
             metadata={
-                "issues": [i["type"].value for i in issues],
+                "issues": [issue_type.value for issue_type, _ in issues],
                 "enhanced": bool(issues),
                 "confidence_score": confidence_score,
                 "data_age_hours": data_age_hours
             }
         )
 
+    def _contains_advice(self, response_lower: str) -> bool:
+        """
+        Check a lowercased response for investment advice phrasing.
+
+        Uses one Hyperscan pass when enabled; non-ASCII responses go to the
+        re patterns, whose \\s also matches Unicode whitespace.
+
+        Args:
+            response_lower: Response text, already lowercased
+
+        Returns:
+            True if any advice pattern matches
+        """
+        if self._hyperscan is None or not response_lower.isascii():
+            return any(p.search(response_lower) for p in self._advice_regex)
+
+        database, _ = self._hyperscan
+        matched = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            matched.append(pattern_id)
+
+        database.scan(
+            response_lower.encode(),
+            match_event_handler=on_match,
+            scratch=_hyperscan_scratch(database, self._hyperscan_local)
+        )
+        return bool(matched)
+
     def _enhance_response(
         self,
         response: str,
-        issues: List[Dict],
+        issues: List[Tuple[GuardrailViolationType, str]],
         confidence_score: float
     ) -> str:
         """
@@ -416,25 +719,28 @@ class OutputGuardrails:
 
         Args:
             response: Original response text
-            issues: List of identified issues
+            issues: Identified (violation type, message) pairs
             confidence_score: Research confidence score
 
         Returns:
             Enhanced response with warnings/disclaimers
         """
         warnings = []
+        has_disclaimer_issue = False
 
-        for issue in issues:
-            if issue["type"] == GuardrailViolationType.LOW_CONFIDENCE:
+        for issue_type, _ in issues:
+            if issue_type == GuardrailViolationType.LOW_CONFIDENCE:
                 warnings.append(
                     f"**Note:** This research has a confidence score of "
                     f"{confidence_score:.1f}/10. Some information may be incomplete or limited."
                 )
-            elif issue["type"] == GuardrailViolationType.STALE_DATA:
+            elif issue_type == GuardrailViolationType.STALE_DATA:
                 warnings.append(
                     "**Note:** Some data may not reflect the most recent information. "
                     "Please verify with current sources for time-sensitive decisions."
                 )
+            elif issue_type == GuardrailViolationType.MISSING_DISCLAIMER:
+                has_disclaimer_issue = True
 
         enhanced = response
 
@@ -444,11 +750,6 @@ class OutputGuardrails:
             enhanced = f"{warning_block}\n\n---\n\n{enhanced}"
 
         # Append disclaimer if required
-        has_disclaimer_issue = any(
-            i["type"] == GuardrailViolationType.MISSING_DISCLAIMER
-            for i in issues
-        )
-
         if has_disclaimer_issue or self.config.require_disclaimers:
             if "DISCLAIMER" not in enhanced:
                 enhanced = enhanced + "\n\n" + self.FINANCIAL_DISCLAIMER
@@ -460,6 +761,33 @@ class OutputGuardrails:
 # COMPANY NAME VALIDATOR - Normalize company names and tickers
 # ============================================================================
 
+def _compile_alias_regex(aliases: Dict[str, str], min_substring_length: int) -> "re.Pattern[str]":
+    """
+    Compile all company aliases into one alternation for a single scan.
+
+    Short aliases must match as whole words; longer ones must start at a
+    word boundary but may run into a suffix ("apples", "teslas"), so
+    "pineapple" no longer resolves to Apple. Longer aliases come first so
+    the longest alias wins at a given position ("goldman sachs" over
+    "goldman").
+
+    Args:
+        aliases: Lowercase alias to canonical company name
+        min_substring_length: Aliases shorter than this need both boundaries
+
+    Returns:
+        Compiled alias regex; match.group(0) is the alias key
+    """
+    alternatives = []
+    for alias in sorted(aliases, key=len, reverse=True):
+        escaped = re.escape(alias)
+        if len(alias) < min_substring_length:
+            alternatives.append(rf"\b{escaped}\b")
+        else:
+            alternatives.append(rf"\b{escaped}")
+    return re.compile("|".join(alternatives))
+
+
 class CompanyNameValidator:
     """
     Validates and normalizes company names and ticker symbols.
@@ -656,9 +984,41 @@ class CompanyNameValidator:
         "IBM": "International Business Machines Corporation",
     }
 
+    # Company to ticker; reversed so the first listed ticker wins for
+    # companies with several share classes (GOOGL, BRK.A)
+    _COMPANY_TO_TICKER = {
+        company: ticker for ticker, company in reversed(TICKER_MAP.items())
+    }
+
     # Minimum length for substring matching (shorter aliases require word boundary)
     MIN_SUBSTRING_LENGTH = 4
 
+    # Candidate ticker symbols: whole words of 1-5 letters
+    _TICKER_RE = re.compile(r"\b[A-Z]{1,5}\b")
+
+    # All aliases in one regex, scanned once per query
+    _ALIAS_RE = _compile_alias_regex(COMPANY_ALIASES, MIN_SUBSTRING_LENGTH)
+
+    # Aliases longest first (stable, so dict order breaks ties); the
+    # partial-name fallback takes the first one containing the name
+    _ALIASES_LONGEST_FIRST = tuple(sorted(COMPANY_ALIASES, key=len, reverse=True))
+
+    # Company suffixes, each with a regex capturing the words before it.
+    # The capture always starts at the first word of a run of words and
+    # whitespace, so matching is only attempted at the start of a run
+    # (string start or after punctuation); retrying inside a run that
+    # already failed made long queries quadratic.
+    _SUFFIX_PATTERNS = tuple(
+        (suffix, re.compile(rf"(?:^|(?<=[^\w\s]))\s*(\w+(?:\s+\w+)*)\s+{suffix}"))
+        for suffix in ("inc", "corp", "corporation", "company", "ltd")
+    )
+
+    # Read-only views: the tables derived above and the memoized
+    # normalize_company_name would go stale if these were mutated
+    COMPANY_ALIASES = MappingProxyType(COMPANY_ALIASES)
+    TICKER_MAP = MappingProxyType(TICKER_MAP)
+    _COMPANY_TO_TICKER = MappingProxyType(_COMPANY_TO_TICKER)
+
     @classmethod
     def normalize_company_name(cls, query: str) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -670,68 +1030,79 @@ class CompanyNameValidator:
             3. Ticker symbol match
             4. Partial name match
 
+        Matching is case-insensitive, so results are memoized on the
+        lowercased query and "AAPL" and "aapl" share one cache entry.
+
         Args:
             query: User query that may contain company name
 
         Returns:
             Tuple of (canonical_name, ticker) or (None, None) if not found
         """
-        query_lower = query.lower().strip()
+        return cls._normalize_lowered(query.lower().strip())
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_lowered(cls, query_lower: str) -> Tuple[Optional[str], Optional[str]]:
+        """Matching behind normalize_company_name, on a lowercased query."""
+        # Queries that are just an alias ("apple", "aapl") need no scan;
+        # Strategy 1 would match the whole string anyway
+        canonical = cls.COMPANY_ALIASES.get(query_lower)
+        if canonical:
+            return canonical, cls._find_ticker_for_company(canonical)
 
         # Strategy 1: Check for direct alias match
-        # For short aliases (< 4 chars), require word boundaries to avoid false positives
-        for alias, canonical in cls.COMPANY_ALIASES.items():
-            if len(alias) < cls.MIN_SUBSTRING_LENGTH:
-                # Short alias - require word boundary match
-                # Use regex to match as whole word
-                pattern = rf'\b{re.escape(alias)}\b'
-                if re.search(pattern, query_lower):
-                    ticker = cls._find_ticker_for_company(canonical)
-                    return canonical, ticker
-            else:
-                # Longer alias - substring match is acceptable
-                if alias in query_lower:
-                    ticker = cls._find_ticker_for_company(canonical)
-                    return canonical, ticker
+        # The leftmost (then longest) alias in the query wins; short
+        # aliases (< 4 chars) only match as whole words
+        match = cls._ALIAS_RE.search(query_lower)
+        if match:
+            canonical = cls.COMPANY_ALIASES[match.group(0)]
+            ticker = cls._find_ticker_for_company(canonical)
+            return canonical, ticker
 
         # Strategy 2: Check for ticker symbols (uppercase 1-5 letter words)
-        # Must be whole word match
-        ticker_pattern = r'\b([A-Z]{1,5})\b'
-        potential_tickers = re.findall(ticker_pattern, query.upper())
-
-        for ticker in potential_tickers:
-            if ticker in cls.TICKER_MAP:
-                return cls.TICKER_MAP[ticker], ticker
+        # Must be whole word match. A plain ASCII word between spaces is
+        # already a whole word, so only tokens with punctuation or digits
+        # need the regex.
+        for token in query_lower.upper().split():
+            if token.isascii() and token.isalpha():
+                candidates = (token,) if len(token) <= 5 else ()
+            else:
+                candidates = cls._TICKER_RE.findall(token)
+            for ticker in candidates:
+                company = cls.TICKER_MAP.get(ticker)
+                if company:
+                    return company, ticker
 
         # Strategy 3: Try variations
         # Check for "Inc", "Corp", "Company" etc.
-        company_suffixes = ["inc", "corp", "corporation", "company", "ltd"]
-        for suffix in company_suffixes:
+        for suffix, pattern in cls._SUFFIX_PATTERNS:
             if suffix in query_lower:
                 # Try to extract company name before suffix
-                pattern = rf"(\w+(?:\s+\w+)*)\s+{suffix}"
-                match = re.search(pattern, query_lower)
+                match = pattern.search(query_lower)
                 if match:
                     potential_name = match.group(1)
-                    for alias, canonical in cls.COMPANY_ALIASES.items():
-                        # Use word boundary for short names
-                        if len(alias) < cls.MIN_SUBSTRING_LENGTH:
-                            if re.search(rf'\b{re.escape(alias)}\b', potential_name):
-                                ticker = cls._find_ticker_for_company(canonical)
-                                return canonical, ticker
-                        elif potential_name in alias or alias in potential_name:
-                            ticker = cls._find_ticker_for_company(canonical)
-                            return canonical, ticker
+
+                    # Aliases inside the name were already tried by
+                    # Strategy 1; look for the name as part of an alias
+                    # ("cola" -> "coca-cola"). The longest alias wins
+                    # instead of dict order, and very short names are too
+                    # ambiguous to try
+                    if len(potential_name) >= cls.MIN_SUBSTRING_LENGTH:
+                        for alias in cls._ALIASES_LONGEST_FIRST:
+                            # Remaining aliases are too short to contain it
+                            if len(alias) < len(potential_name):
+                                break
+                            if potential_name in alias:
+                                canonical = cls.COMPANY_ALIASES[alias]
+                                return canonical, cls._find_ticker_for_company(canonical)
 
         return None, None
 
     @classmethod
     def _find_ticker_for_company(cls, company_name: str) -> Optional[str]:
         """Find ticker symbol for a company name."""
-        for ticker, company in cls.TICKER_MAP.items():
-            if company == company_name:
-                return ticker
-        return None
+        return cls._COMPANY_TO_TICKER.get(company_name)
 
     @classmethod
     def is_valid_ticker(cls, ticker: str) -> bool:
@@ -761,8 +1132,8 @@ class CompanyNameValidator:
 
     @classmethod
     def get_all_companies(cls) -> List[str]:
-        """Get list of all known company names."""
-        return list(set(cls.TICKER_MAP.values()))
+        """Get list of all known company names, in TICKER_MAP order."""
+        return list(dict.fromkeys(cls.TICKER_MAP.values()))
 
     @classmethod
     def get_all_tickers(cls) -> List[str]:
@@ -774,6 +1145,74 @@ class CompanyNameValidator:
 # AUDIT LOGGER - Compliance audit trail
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def _orjson() -> Any:
+    """
+    Import orjson if it is installed.
+
+    Returns:
+        The orjson module, or None to serialize with the stdlib json
+    """
+    try:
+        import orjson
+        return orjson
+    except ImportError:
+        logger.info("orjson not installed, serializing audit logs with json")
+        return None
+
+
+def _dump_json(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON bytes.
+
+    Uses orjson when available, which is several times faster than json
+    and produces bytes directly; otherwise falls back to json.
+
+    Args:
+        obj: JSON-compatible object
+
+    Returns:
+        Encoded JSON document
+    """
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+@dataclass(frozen=True, slots=True)
+class AuditEvent:
+    """Single audit trail entry."""
+    # Integer epoch nanoseconds; formatted only when serialized
+    timestamp_ns: int
+    event_type: str
+    session_id: str
+    user_id: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        """Mapping-style access, for callers written against dict events."""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the event to its serialized form.
+
+        Returns:
+            Event dict with an ISO-8601 local time "timestamp"
+        """
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat(),
+            "event_type": self.event_type,
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "details": self.details,
+        }
+
+
 class AuditLogger:
     """
     Audit logging for compliance and debugging.
@@ -787,6 +1226,10 @@ class AuditLogger:
         - File persistence (optional)
         - Structured log entries
 
+    A file-backed logger runs a writer thread and registers close() with
+    atexit, so it stays alive until close() is called or the process
+    exits. Call close() when discarding a logger before then.
+
     Usage:
         logger = AuditLogger()
         logger.log_event(
@@ -797,16 +1240,52 @@ class AuditLogger:
         )
     """
 
-    def __init__(self, log_file: Optional[str] = None):
+    # Default number of events kept in memory; older events are dropped
+    # (the log file, if configured, keeps the full trail)
+    DEFAULT_MAX_EVENTS = 100_000
+
+    # Most events the writer thread serializes into one file write
+    WRITE_BATCH_SIZE = 256
+
+    # Queued by close() to stop the writer thread
+    _STOP = object()
+
+    def __init__(self, log_file: Optional[str] = None, max_events: int = DEFAULT_MAX_EVENTS):
         """
         Initialize AuditLogger.
 
         Args:
             log_file: Optional file path for persistent logging
+            max_events: Maximum number of events kept in memory
         """
         self.log_file = log_file
-        self.logs: List[Dict[str, Any]] = []
+        self.logs: Deque[AuditEvent] = deque(maxlen=max_events)
+        # Same events grouped by session, kept in step with self.logs
+        self._by_session: Dict[str, Deque[AuditEvent]] = {}
+        # log_event runs from several request threads; eviction, append
+        # and index update must happen as one step
+        self._lock = threading.Lock()
         self._logger = logging.getLogger("AuditLogger")
+        self._fd: Optional[int] = None
+        self._writer: Optional[threading.Thread] = None
+
+        if log_file:
+            try:
+                # Unbuffered append-only descriptor: each batch is one
+                # write, and O_APPEND keeps concurrent writers from
+                # interleaving inside a batch
+                self._fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            except OSError as e:
+                self._logger.error(f"Failed to open audit log file: {e}")
+            else:
+                # File writes happen on a background thread so log_event
+                # never waits on disk I/O
+                self._queue: queue.SimpleQueue = queue.SimpleQueue()
+                self._writer = threading.Thread(
+                    target=self._drain_queue, name="AuditLogWriter", daemon=True
+                )
+                self._writer.start()
+                atexit.register(self.close)
 
     def log_event(
         self,
@@ -814,7 +1293,7 @@ class AuditLogger:
         session_id: str,
         user_id: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> AuditEvent:
         """
         Log an audit event.
 
@@ -827,32 +1306,115 @@ class AuditLogger:
         Returns:
             The logged event entry
         """
-        event = {
-            "timestamp": datetime.now().isoformat(),
-            "event_type": event_type,
-            "session_id": session_id,
-            "user_id": user_id,
-            "details": details or {}
-        }
+        event = AuditEvent(
+            timestamp_ns=time.time_ns(),
+            event_type=event_type,
+            session_id=session_id,
+            user_id=user_id,
+            details=details or {}
+        )
+
+        with self._lock:
+            if len(self.logs) == self.logs.maxlen:
+                # The append below evicts the oldest event, which is also
+                # the oldest one in its session's index
+                oldest = self.logs[0]
+                session_events = self._by_session[oldest.session_id]
+                session_events.popleft()
+                if not session_events:
+                    del self._by_session[oldest.session_id]
+
+            self.logs.append(event)
+            self._by_session.setdefault(session_id, deque()).append(event)
 
-        self.logs.append(event)
-        self._logger.info(f"Audit: {event_type} - Session: {session_id}")
+            # Write to file if configured; queued under the lock so the
+            # file keeps the same order as self.logs
+            if self.log_file:
+                self._write_to_file(event)
 
-        # Write to file if configured
-        if self.log_file:
-            self._write_to_file(event)
+        # The event itself is the audit record; this echo is for debugging
+        # only, with deferred %-formatting as it runs for every event
+        self._logger.debug("Audit: %s - Session: %s", event_type, session_id)
 
         return event
 
-    def _write_to_file(self, event: Dict[str, Any]) -> None:
-        """Write event to log file."""
-        try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(event) + '\n')
-        except IOError as e:
-            self._logger.error(f"Failed to write audit log: {e}")
+    def _write_to_file(self, event: AuditEvent) -> None:
+        """Queue event for the background writer."""
+        if self._writer is not None:
+            self._queue.put(event)
+
+    def _drain_queue(self) -> None:
+        """
+        Writer thread loop: write queued events to the log file in batches.
 
-    def get_session_logs(self, session_id: str) -> List[Dict[str, Any]]:
+        Each pass blocks for one item, then takes whatever else is already
+        queued (up to WRITE_BATCH_SIZE) and writes the batch with a single
+        os.write. threading.Event items are flush() requests, set once
+        everything queued before them is written.
+        """
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.WRITE_BATCH_SIZE:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            data = bytearray()
+            waiters = []
+            for item in batch:
+                if isinstance(item, AuditEvent):
+                    try:
+                        data += _dump_json(item.to_dict())
+                        data += b'\n'
+                    except (TypeError, ValueError) as e:
+                        # Unserializable or circular details: drop this
+                        # event, keep the writer alive for the rest
+                        self._logger.error(f"Failed to serialize audit event: {e}")
+                elif item is self._STOP:
+                    stopping = True
+                else:
+                    waiters.append(item)
+
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(self._fd, view):]
+            except OSError as e:
+                self._logger.error(f"Failed to write audit log: {e}")
+
+            for waiter in waiters:
+                waiter.set()
+
+    def flush(self) -> None:
+        """Block until every event logged so far is written to the log file."""
+        writer = self._writer
+        if writer is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        # A writer that died would never set the event
+        while not done.wait(0.1):
+            if not writer.is_alive():
+                self._logger.error("Audit log writer stopped; pending events not written")
+                return
+
+    def close(self) -> None:
+        """Write pending events and close the log file. Safe to call more than once."""
+        # Under the lock, so a concurrent log_event can't queue its event
+        # after _STOP, where the writer would never see it
+        with self._lock:
+            if self._writer is None:
+                return
+            writer, self._writer = self._writer, None
+            self._queue.put(self._STOP)
+        writer.join()
+        os.close(self._fd)
+        self._fd = None
+        atexit.unregister(self.close)
+
+    def get_session_logs(self, session_id: str) -> List[AuditEvent]:
         """
         Get all logs for a specific session.
 
@@ -862,9 +1424,10 @@ class AuditLogger:
         Returns:
             List of log entries for the session
         """
-        return [log for log in self.logs if log["session_id"] == session_id]
+        with self._lock:
+            return list(self._by_session.get(session_id, ()))
 
-    def get_recent_logs(self, count: int = 100) -> List[Dict[str, Any]]:
+    def get_recent_logs(self, count: int = 100) -> List[AuditEvent]:
         """
         Get the most recent log entries.
 
@@ -874,24 +1437,49 @@ class AuditLogger:
         Returns:
             List of recent log entries
         """
-        return self.logs[-count:]
+        with self._lock:
+            return list(islice(self.logs, max(0, len(self.logs) - count), None))
 
     def export_logs(self, filepath: str) -> None:
         """
         Export all logs to a JSON file.
 
+        The file holds a JSON array with one event per line. Events are
+        serialized and written one at a time, so the export never builds
+        the whole document in memory.
+
         Args:
             filepath: Path to export file
         """
-        with open(filepath, 'w') as f:
-            json.dump(self.logs, f, indent=2)
-        self._logger.info(f"Exported {len(self.logs)} log entries to {filepath}")
+        # Snapshot of references, so events logged meanwhile can't
+        # invalidate the iteration
+        with self._lock:
+            events = tuple(self.logs)
+        with open(filepath, 'wb') as f:
+            f.write(b'[')
+            for i, event in enumerate(events):
+                f.write(b',\n' if i else b'\n')
+                f.write(_dump_json(event.to_dict()))
+            f.write(b'\n]\n')
+        self._logger.info(f"Exported {len(events)} log entries to {filepath}")
 
 
 # ============================================================================
 # CONVENIENCE FUNCTIONS
 # ============================================================================
 
+@lru_cache(maxsize=16)
+def _shared_input_guardrails(config: GuardrailConfig) -> InputGuardrails:
+    """Return one InputGuardrails per config for the convenience functions."""
+    return InputGuardrails(config)
+
+
+@lru_cache(maxsize=16)
+def _shared_output_guardrails(config: GuardrailConfig) -> OutputGuardrails:
+    """Return one OutputGuardrails per config for the convenience functions."""
+    return OutputGuardrails(config)
+
+
 def validate_research_query(
     query: str,
     config: Optional[GuardrailConfig] = None
@@ -908,8 +1496,7 @@ def validate_research_query(
     Returns:
         GuardrailResult with validation status
     """
-    guardrails = InputGuardrails(config)
-    return guardrails.validate_query(query)
+    return _shared_input_guardrails(config or GuardrailConfig()).validate_query(query)
 
 
 def validate_research_output(
@@ -932,5 +1519,5 @@ def validate_research_output(
     Returns:
         GuardrailResult with validation status and enhanced response
     """
-    guardrails = OutputGuardrails(config)
+    guardrails = _shared_output_guardrails(config or GuardrailConfig())
     return guardrails.validate_response(response, confidence_score, data_age_hours)
@@ -7,6 +7,7 @@ Pretty simple stuff - just checking status values and confidence scores.
 
 from typing import Any, Dict, Literal
 from ..config import settings
+from ..state import ClarityStatus, ValidationResult
 
 
 def route_after_clarity(state: Dict[str, Any]) -> Literal["human_clarification", "research"]:
@@ -15,7 +16,7 @@ def route_after_clarity(state: Dict[str, Any]) -> Literal["human_clarification",
     - If query is confusing -> ask the user
     - If query is clear -> start researching
     """
-    if state.get("clarity_status") == "needs_clarification":
+    if state.get("clarity_status") == ClarityStatus.NEEDS_CLARIFICATION:
         return "human_clarification"
     return "research"
 
@@ -38,9 +39,10 @@ def route_after_validation(state: Dict[str, Any]) -> Literal["research", "synthe
     - If it's not good enough AND we haven't hit 3 tries -> retry
     - Otherwise -> synthesize what we have
     """
-    result = state.get("validation_result", "pending")
+    result = state.get("validation_result", ValidationResult.PENDING)
     attempts = state.get("research_attempts", 0)
 
-    if result == "insufficient" and attempts < settings.max_research_attempts:
+    if (result == ValidationResult.INSUFFICIENT and
+            attempts < settings.max_research_attempts):
         return "research"  # try again
     return "synthesis"  # good enough or out of retries
@@ -36,11 +36,17 @@ class QueryCache:
         logger.info(f"Cache initialized (max_size={self.max_size}, ttl={self.ttl_seconds}s)")
 
     def _generate_key(self, query: str, company: Optional[str] = None) -> str:
-        """Generate a cache key from query and company name."""
-        normalized = query.lower().strip()
+        """
+        Generate a cache key from query and company name.
+
+        The query is canonicalized (case, inner whitespace, trailing
+        punctuation) so near-identical phrasings share one entry and
+        skip the whole workflow run.
+        """
+        normalized = " ".join(query.lower().split()).rstrip("?!. ")
         if company:
             normalized += f"|{company.lower().strip()}"
-        return hashlib.md5(normalized.encode()).hexdigest()
+        return hashlib.sha256(normalized.encode()).hexdigest()
 
     def get(self, query: str, company: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
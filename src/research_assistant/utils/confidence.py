@@ -131,7 +131,9 @@ class ConfidenceScorer:
         # keep it in bounds
         breakdown.final_score = max(0.0, min(10.0, breakdown.final_score))
 
-        logger.debug(f"Confidence breakdown: {breakdown.to_dict()}")
+        # to_dict() rounds and copies every field, so only build it when logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Confidence breakdown: %s", breakdown.to_dict())
 
         return breakdown
 
@@ -127,6 +127,19 @@ class TestAPIEndpoints:
         response = client.get("/conversation/nonexistent")
         assert response.status_code == 404
 
+    def test_end_conversation(self, client, mock_app):
+        """Test ending a conversation releases it."""
+        mock_app.end_conversation.return_value = True
+        response = client.delete("/conversation/test-thread-123")
+        assert response.status_code == 200
+        mock_app.end_conversation.assert_called_once_with("test-thread-123")
+
+    def test_end_nonexistent_conversation(self, client, mock_app):
+        """Test ending an unknown conversation."""
+        mock_app.end_conversation.return_value = False
+        response = client.delete("/conversation/nonexistent")
+        assert response.status_code == 404
+
     def test_cache_stats(self, client):
         """Test getting cache statistics."""
         response = client.get("/cache/stats")
@@ -167,3 +167,18 @@ class TestQueryCache:
             # Should match regardless of case
             result = cache.get("tell me about apple")
             assert result is not None
+
+    def test_cache_key_ignores_whitespace_and_punctuation(self):
+        """Near-identical phrasings should share a cache entry."""
+        with patch("src.research_assistant.utils.cache.settings") as mock_settings:
+            mock_settings.cache_max_size = 10
+            mock_settings.cache_ttl_seconds = 3600
+            mock_settings.enable_cache = True
+
+            from src.research_assistant.utils.cache import QueryCache
+            cache = QueryCache()
+
+            cache.set("Tell me about Apple?", {"data": "value"})
+
+            assert cache.get("  tell me   about apple ") is not None
+            assert cache.get("tell me about apple stock") is None
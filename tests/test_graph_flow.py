@@ -25,6 +25,14 @@ class TestGraphConstruction:
         # The compiled graph should be functional
         assert graph is not None
 
+    def test_default_graph_is_reused(self, mock_settings):
+        """Default builds should share one compiled graph."""
+        from langgraph.checkpoint.memory import MemorySaver
+
+        assert build_research_graph() is build_research_graph()
+        custom = build_research_graph(checkpointer=MemorySaver())
+        assert custom is not build_research_graph()
+
     def test_graph_visualization(self):
         diagram = get_graph_visualization()
         assert "mermaid" in diagram
@@ -33,6 +41,24 @@ class TestGraphConstruction:
         assert "validator" in diagram.lower()
         assert "synthesis" in diagram.lower()
 
+    def test_end_conversation_uses_stored_checkpoints(self, mock_settings):
+        """Threads known only to the checkpointer (e.g. after a restart) are deleted and reported."""
+        from src.research_assistant.app import ResearchAssistantApp
+
+        app = ResearchAssistantApp(enable_audit_logging=False)
+        app.checkpointer = MagicMock()
+
+        # Stored history but no in-memory session
+        app.checkpointer.get_tuple.return_value = object()
+        assert app.end_conversation("restored-thread") is True
+        app.checkpointer.delete_thread.assert_called_once_with("restored-thread")
+
+        # Unknown everywhere: nothing is deleted
+        app.checkpointer.reset_mock()
+        app.checkpointer.get_tuple.return_value = None
+        assert app.end_conversation("missing-thread") is False
+        app.checkpointer.delete_thread.assert_not_called()
+
 
 class TestGraphExecution:
     """Tests for graph execution with mocked LLM."""
@@ -96,3 +122,16 @@ class TestGraphEdgeCases:
         state = {"confidence_score": 8.0}
         from src.research_assistant.routing.conditions import route_after_research
         assert route_after_research(state) == "synthesis"
+
+    def test_safe_node_captures_error(self):
+        """Safe node wrapper should turn exceptions into error state."""
+        from src.research_assistant.graph import create_safe_node
+
+        def failing_node(state):
+            raise ValueError("boom")
+
+        result = create_safe_node("research", failing_node)({})
+        assert result["has_error"] is True
+        assert result["error_message"] == "boom"
+        assert result["error_node"] == "research"
+        assert result["messages"][0].content == "[research] Error: boom"
@@ -36,6 +36,13 @@ class TestRouteAfterClarity:
         state = {}
         assert route_after_clarity(state) == "research"
 
+    def test_accepts_enum_members(self):
+        """Enum members and their string values should route the same."""
+        from src.research_assistant.state import ClarityStatus
+
+        state = {"clarity_status": ClarityStatus.NEEDS_CLARIFICATION}
+        assert route_after_clarity(state) == "human_clarification"
+
 
 class TestRouteAfterResearch:
     """Tests for research routing function."""